@@ -0,0 +1,139 @@
+"""Airport reference data for distance-based revenue.
+
+Reads OurAirports-style CSV exports (https://ourairports.com/data/) and keeps an
+in-memory index built once: coordinates live in flat arrays, a 1°x1° grid buckets
+them for nearest-airport searches, and great-circle distances are memoized per
+ICAO pair. No database access happens here; app.py owns the Airport table and
+hands its rows to AirportIndex.
+"""
+import csv
+from array import array
+from functools import lru_cache
+from math import floor, radians, sin, cos, atan2, sqrt
+
+EARTH_RADIUS_NM = 3440.065
+GRID_DEG = 1.0
+LON_CELLS = int(360 / GRID_DEG)
+DISTANCE_CACHE_SIZE = 16384
+
+# Airport types worth indexing; heliports, seaplane bases and closed fields are skipped
+DEFAULT_AIRPORT_TYPES = {'large_airport', 'medium_airport', 'small_airport'}
+
+
+def haversine_nm(lat1, lon1, lat2, lon2):
+    """Great-circle distance in nautical miles."""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat/2)**2 + cos(radians(lat1))*cos(radians(lat2))*sin(dlon/2)**2
+    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    return EARTH_RADIUS_NM * c
+
+
+def read_ourairports_csv(path, types=DEFAULT_AIRPORT_TYPES):
+    """Yield normalized airport dicts from an OurAirports airports.csv file.
+
+    Each dict has ident, name, type, latitude, longitude, iso_country, municipality.
+    Rows with a missing ident or non-numeric coordinates are skipped. When the
+    export carries a separate icao_code / gps_code, that code is used as ident.
+    """
+    with open(path, newline='', encoding='utf-8') as fh:
+        for row in csv.DictReader(fh):
+            if types and row.get('type') not in types:
+                continue
+            ident = (row.get('icao_code') or row.get('gps_code') or row.get('ident') or '').strip().upper()
+            if not ident:
+                continue
+            try:
+                lat = float(row.get('latitude_deg'))
+                lon = float(row.get('longitude_deg'))
+            except (TypeError, ValueError):
+                continue
+            yield {
+                'ident': ident,
+                'name': (row.get('name') or '').strip(),
+                'type': row.get('type'),
+                'latitude': lat,
+                'longitude': lon,
+                'iso_country': row.get('iso_country'),
+                'municipality': row.get('municipality')
+            }
+
+
+def _cell(lat, lon):
+    # Longitude cells wrap, so -180 and 180 share a cell and the antimeridian has neighbours
+    return (int(floor(lat / GRID_DEG)), int(floor(lon / GRID_DEG)) % LON_CELLS)
+
+
+class AirportIndex:
+    """Immutable in-memory airport index.
+
+    Build once from (ident, lat, lon) rows; lookups are dict/array access and the
+    pairwise distance cache makes repeated route lookups O(1).
+    """
+
+    def __init__(self, rows=()):
+        self.idents = []
+        self.lats = array('d')
+        self.lons = array('d')
+        self._pos = {}
+        self._grid = {}
+        for ident, lat, lon in rows:
+            key = (ident or '').strip().upper()
+            if not key or key in self._pos:
+                continue
+            i = len(self.idents)
+            self.idents.append(key)
+            self.lats.append(float(lat))
+            self.lons.append(float(lon))
+            self._pos[key] = i
+            self._grid.setdefault(_cell(lat, lon), []).append(i)
+        self._pair_distance = lru_cache(maxsize=DISTANCE_CACHE_SIZE)(self._compute_pair_distance)
+
+    def __len__(self):
+        return len(self.idents)
+
+    def __contains__(self, icao):
+        return (icao or '').strip().upper() in self._pos
+
+    def coords(self, icao):
+        """(lat, lon) for an ICAO ident, or None if unknown."""
+        i = self._pos.get((icao or '').strip().upper())
+        if i is None:
+            return None
+        return self.lats[i], self.lons[i]
+
+    def distance_nm(self, a, b):
+        """Great-circle distance between two idents, None if either is unknown."""
+        a = (a or '').strip().upper()
+        b = (b or '').strip().upper()
+        if a not in self._pos or b not in self._pos:
+            return None
+        if a == b:
+            return 0.0
+        # Distance is symmetric: normalize the key so A->B and B->A share an entry
+        return self._pair_distance(*sorted((a, b)))
+
+    def _compute_pair_distance(self, a, b):
+        i, j = self._pos[a], self._pos[b]
+        return haversine_nm(self.lats[i], self.lons[i], self.lats[j], self.lons[j])
+
+    def nearest(self, lat, lon, max_nm=50.0):
+        """Closest indexed airport to a position within max_nm as (ident, distance_nm), else None.
+
+        Only grid cells overlapping the search radius are scanned.
+        """
+        reach_lat = int(max_nm / 60.0 / GRID_DEG) + 1
+        cos_lat = max(cos(radians(lat)), 0.01)
+        reach_lon = min(int(max_nm / (60.0 * cos_lat) / GRID_DEG) + 1, LON_CELLS // 2)
+        c_lat, c_lon = _cell(lat, lon)
+        best = None
+        for dy in range(-reach_lat, reach_lat + 1):
+            for dx in range(-reach_lon, reach_lon + 1):
+                for i in self._grid.get((c_lat + dy, (c_lon + dx) % LON_CELLS), ()):
+                    d = haversine_nm(lat, lon, self.lats[i], self.lons[i])
+                    if d <= max_nm and (best is None or d < best[1]):
+                        best = (self.idents[i], d)
+        return best
+
+    def cache_info(self):
+        return self._pair_distance.cache_info()
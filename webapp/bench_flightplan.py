@@ -0,0 +1,89 @@
+"""Benchmark: streaming flightplan.parse_pln vs the previous ElementTree.fromstring parser.
+
+Generates synthetic MSFS .pln documents of increasing size and reports wall time
+and peak traced memory for both parsers, after checking they agree.
+
+    python bench_flightplan.py [waypoint counts...]
+"""
+import sys
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+
+import flightplan
+
+
+def legacy_parse_pln(content):
+    """The tree-building parser parse_pln used before flightplan.py (kept for comparison)."""
+    data = flightplan.empty_plan()
+    if not content or '<SimBase.Document' not in content:
+        return data
+    try:
+        root = ET.fromstring(content.strip())
+    except Exception:
+        return data
+    fp = None
+    for child in root.iter():
+        if child.tag.endswith('FlightPlan'):
+            fp = child
+    if fp is None:
+        return data
+    ca = fp.find('CruisingAlt')
+    if ca is not None and ca.text:
+        data['cruising_alt'] = ca.text.strip()
+    for wp in fp.findall('ATCWaypoint'):
+        ident_el = wp.find('./ICAO/ICAOIdent')
+        if ident_el is None or not ident_el.text:
+            continue
+        wptype_el = wp.find('ATCWaypointType')
+        airway_el = wp.find('ATCAirway')
+        pos_el = wp.find('WorldPosition')
+        lat, lon = flightplan.parse_world_position(pos_el.text if pos_el is not None else None)
+        data['waypoints'].append({
+            'ident': ident_el.text.strip(),
+            'type': wptype_el.text.strip() if (wptype_el is not None and wptype_el.text) else None,
+            'airway': airway_el.text.strip() if (airway_el is not None and airway_el.text) else None,
+            'lat': lat,
+            'lon': lon
+        })
+    return data
+
+
+def make_pln(n_waypoints):
+    parts = ['<?xml version="1.0" encoding="UTF-8"?>\n<SimBase.Document Type="AceXML" version="1,0">\n'
+             '<Descr>AceXML Document</Descr>\n<FlightPlan.FlightPlan>\n<CruisingAlt>9500</CruisingAlt>\n']
+    for i in range(n_waypoints):
+        lat = 30 + (i % 900) / 100.0
+        lon = 100 + (i % 1700) / 100.0
+        parts.append(
+            f'<ATCWaypoint id="WP{i:05d}"><ATCWaypointType>Intersection</ATCWaypointType>'
+            f'<ATCAirway>V{i // 50}</ATCAirway>'
+            f'<WorldPosition>N{int(lat)}° {int(lat % 1 * 60)}\' 0.00",W{int(lon)}° {int(lon % 1 * 60)}\' 0.00",+009500.00</WorldPosition>'
+            f'<SpeedMaxFP>-1</SpeedMaxFP><ICAO><ICAORegion>K2</ICAORegion><ICAOIdent>WP{i:05d}</ICAOIdent></ICAO>'
+            f'</ATCWaypoint>\n')
+    parts.append('</FlightPlan.FlightPlan>\n</SimBase.Document>\n')
+    return ''.join(parts)
+
+
+def measure(fn, content):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    result = fn(content)
+    elapsed = time.perf_counter() - t0
+    _current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main(counts):
+    print(f"{'waypoints':>10} {'size MB':>8} {'legacy s':>9} {'stream s':>9} {'legacy peak MB':>15} {'stream peak MB':>15}")
+    for n in counts:
+        content = make_pln(n)
+        old, t_old, m_old = measure(legacy_parse_pln, content)
+        new, t_new, m_new = measure(flightplan.parse_pln, content)
+        assert old['waypoints'] == new['waypoints'] and old['cruising_alt'] == new['cruising_alt']
+        print(f'{n:>10} {len(content) / 1e6:>8.1f} {t_old:>9.3f} {t_new:>9.3f} {m_old / 1e6:>15.1f} {m_new / 1e6:>15.1f}')
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or [1000, 10000, 30000])
@@ -0,0 +1,108 @@
+"""Benchmark: concurrent reads and writes under each SQLite connection profile.
+
+For every profile in app.SQLITE_PROFILES a fresh file-backed database is served
+by a multi-threaded WSGI server (werkzeug, threaded=True). Reader threads load
+the dashboard while writer threads log crew flights (one transaction each) for
+a fixed duration, then requests/s and failures are reported per profile.
+
+    python bench_sqlite_profile.py [seconds] [readers] [writers]
+
+Each profile runs in its own subprocess because the profile and database path
+are read when app.py is imported.
+"""
+import http.cookiejar
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+
+def _client(base_url):
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(http.cookiejar.CookieJar()))
+    login = urllib.parse.urlencode({'email': 'admin@palmroute.local', 'password': 'pilot'}).encode()
+    opener.open(base_url + '/login', data=login).read()
+    return opener
+
+
+def _worker(base_url, deadline, request_fn, stats, key):
+    opener = _client(base_url)
+    i = 0
+    while time.perf_counter() < deadline:
+        t0 = time.perf_counter()
+        try:
+            request_fn(opener, base_url, i)
+            stats[key]['ok'] += 1
+            stats[key]['latency'].append(time.perf_counter() - t0)
+        except (urllib.error.HTTPError, urllib.error.URLError):
+            stats[key]['failed'] += 1
+        i += 1
+
+
+def read_dashboard(opener, base_url, _i):
+    opener.open(base_url + '/').read()
+
+
+def write_crew_log(opener, base_url, i):
+    form = urllib.parse.urlencode({'date': '2026-01-01', 'flight_id': f'W{i:05d}', 'origin': 'KPOC',
+                                   'destination': 'KCRQ', 'fuel_used': str(25 + i % 10),
+                                   'dispatch_release_id': '1'}).encode()
+    opener.open(base_url + '/crew', data=form).read()
+
+
+def run_profile(seconds, readers, writers):
+    """Child process: serve the app on a random port and hammer it (profile/db from the environment)."""
+    from werkzeug.serving import make_server
+    import app as pra
+    pra.app.logger.disabled = True
+    with pra.app.app_context():
+        pra.init_database(log=lambda *_a: None)
+    server = make_server('127.0.0.1', 0, pra.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f'http://127.0.0.1:{server.server_port}'
+    stats = {k: {'ok': 0, 'failed': 0, 'latency': []} for k in ('read', 'write')}
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=_worker, args=(base_url, deadline, read_dashboard, stats, 'read'))
+               for _ in range(readers)]
+    threads += [threading.Thread(target=_worker, args=(base_url, deadline, write_crew_log, stats, 'write'))
+                for _ in range(writers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.shutdown()
+    result = {}
+    for key, st in stats.items():
+        lat = sorted(st['latency'])
+        result[key] = {'rps': st['ok'] / seconds, 'failed': st['failed'],
+                       'p95_ms': lat[int(len(lat) * 0.95) - 1] * 1000 if lat else 0.0}
+    print(json.dumps(result))
+
+
+def main(seconds, readers, writers):
+    import app as pra
+    print(f'{seconds}s per profile, {readers} reader / {writers} writer threads')
+    print(f"{'profile':<8} {'reads/s':>8} {'read p95 ms':>12} {'writes/s':>9} {'write p95 ms':>13} {'failed':>7}")
+    for profile in pra.SQLITE_PROFILES:
+        with tempfile.TemporaryDirectory() as tmp:
+            env = dict(os.environ, PRA_SQLITE_PROFILE=profile, PRA_DB_PATH=os.path.join(tmp, 'bench.db'))
+            out = subprocess.run([sys.executable, __file__, '--child', str(seconds), str(readers), str(writers)],
+                                 env=env, capture_output=True, text=True, check=True).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"{profile:<8} {r['read']['rps']:>8.1f} {r['read']['p95_ms']:>12.1f} {r['write']['rps']:>9.1f} "
+              f"{r['write']['p95_ms']:>13.1f} {r['read']['failed'] + r['write']['failed']:>7}")
+
+
+if __name__ == '__main__':
+    args = sys.argv[1:]
+    if args and args[0] == '--child':
+        run_profile(float(args[1]), int(args[2]), int(args[3]))
+    else:
+        main(float(args[0]) if len(args) > 0 else 10.0,
+             int(args[1]) if len(args) > 1 else 8,
+             int(args[2]) if len(args) > 2 else 2)
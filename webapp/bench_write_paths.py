@@ -0,0 +1,134 @@
+"""Benchmark: one transaction per user action vs the previous commit-per-step write paths.
+
+Runs against a throwaway file-backed SQLite database (PRA_DB_PATH), so every
+commit pays for a real fsync. For each action the legacy sequence (a commit after
+every step, as the routes used to do) is timed against the same steps inside a
+single unit_of_work().
+
+    python bench_write_paths.py [iterations]
+"""
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+_tmp = tempfile.TemporaryDirectory()
+os.environ['PRA_DB_PATH'] = os.path.join(_tmp.name, 'bench.db')
+
+import app as pra  # noqa: E402  (must follow PRA_DB_PATH)
+from app import db, CargoManifest, CrewLog, DispatchRelease  # noqa: E402
+
+
+def _new_dispatch(i):
+    return DispatchRelease(date='2026-01-01', flight_id=f'B{i:05d}', departure='KPOC', destination='KCRQ',
+                           payload_planned=500, fuel_planned=30)
+
+
+def _new_manifest():
+    manifest = CargoManifest(date='2026-01-01', departure='KPOC', arrival='KCRQ', total_weight=420, pieces=3)
+    db.session.add(manifest)
+    db.session.commit()
+    return manifest
+
+
+# --- legacy: commit after every step ---------------------------------------
+
+def legacy_create_dispatch(i, manifest):
+    d = _new_dispatch(i)
+    db.session.add(d)
+    db.session.flush()
+    db.session.commit()
+    pra.book_dispatch_financials(d)
+    db.session.commit()
+    manifest.dispatch_release_id = d.id
+    db.session.commit()
+    # Cargo weight used to be re-summed and committed separately
+    db.session.execute(db.update(DispatchRelease).where(DispatchRelease.id == d.id).values(
+        actual_cargo_weight=db.select(db.func.sum(CargoManifest.total_weight))
+        .where(CargoManifest.dispatch_release_id == d.id).scalar_subquery()))
+    db.session.commit()
+    return d
+
+
+def legacy_log_crew(d):
+    log = CrewLog(date='2026-01-01', flight_id=d.flight_id, origin='KPOC', destination='KCRQ',
+                  fuel_used=33, dispatch_release_id=d.id)
+    db.session.add(log)
+    db.session.commit()
+    pra.reconcile_fuel(log)
+    db.session.commit()
+    return log
+
+
+def legacy_edit_fuel(log):
+    log.fuel_used = 27
+    db.session.commit()
+    pra.reconcile_fuel(log, replace=True)  # used to commit the reversal and the new entry separately
+    db.session.commit()
+    db.session.commit()
+
+
+# --- unit of work: one commit per action ------------------------------------
+
+def uow_create_dispatch(i, manifest):
+    with pra.unit_of_work():
+        d = _new_dispatch(i)
+        db.session.add(d)
+        db.session.flush()
+        pra.book_dispatch_financials(d)
+        manifest.dispatch_release_id = d.id
+    return d
+
+
+def uow_log_crew(d):
+    with pra.unit_of_work():
+        log = CrewLog(date='2026-01-01', flight_id=d.flight_id, origin='KPOC', destination='KCRQ',
+                      fuel_used=33, dispatch_release_id=d.id)
+        db.session.add(log)
+        db.session.flush()
+        pra.reconcile_fuel(log)
+    return log
+
+
+def uow_edit_fuel(log):
+    with pra.unit_of_work():
+        log.fuel_used = 27
+        pra.reconcile_fuel(log, replace=True)
+
+
+def _timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - t0) * 1000.0
+
+
+def run(create, log_crew, edit_fuel, iterations, offset):
+    times = {'create dispatch': [], 'log crew flight': [], 'edit fuel': []}
+    for i in range(iterations):
+        manifest = _new_manifest()
+        d, ms = _timed(create, offset + i, manifest)
+        times['create dispatch'].append(ms)
+        log, ms = _timed(log_crew, d)
+        times['log crew flight'].append(ms)
+        _none, ms = _timed(edit_fuel, log)
+        times['edit fuel'].append(ms)
+    return times
+
+
+def main(iterations):
+    with pra.app.app_context():
+        pra.init_database(log=lambda *_a: None)
+        legacy = run(legacy_create_dispatch, legacy_log_crew, legacy_edit_fuel, iterations, 0)
+        uow = run(uow_create_dispatch, uow_log_crew, uow_edit_fuel, iterations, iterations)
+    print(f'{iterations} iterations on {os.environ["PRA_DB_PATH"]}')
+    print(f"{'action':<18} {'legacy p50 ms':>14} {'uow p50 ms':>11} {'legacy p95 ms':>14} {'uow p95 ms':>11}")
+    for action in legacy:
+        old, new = sorted(legacy[action]), sorted(uow[action])
+        p95 = lambda xs: xs[int(len(xs) * 0.95) - 1]  # noqa: E731
+        print(f'{action:<18} {statistics.median(old):>14.2f} {statistics.median(new):>11.2f} '
+              f'{p95(old):>14.2f} {p95(new):>11.2f}')
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
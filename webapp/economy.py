@@ -0,0 +1,144 @@
+"""Palm Route Air economy engine.
+
+Everything in here is a pure function of its arguments: no database access and
+no global randomness. The route layer (app.py) gathers the inputs for a dispatch
+and calls compute_financials(); identical inputs always give identical results,
+which app.py persists as the dispatch's financial snapshot.
+"""
+import hashlib
+import json
+
+from airports import AirportIndex, haversine_nm  # noqa: F401 (re-exported)
+
+ECONOMY_CONSTANTS = {
+    'BASE_FLIGHT_REVENUE': 250.0,          # base revenue per dispatch
+    'REVENUE_PER_LB': 0.35,                # revenue per pound of planned (or actual) payload
+    'FUEL_COST_PER_UNIT': 5.25,            # cost per unit (gal or labeled unit)
+    'MAINTENANCE_FLAT': 110.0,             # flat maintenance cost per flight
+    'REVENUE_PER_NM': 1.15                # distance-based revenue component per nautical mile
+}
+
+DIFFICULTY_MULTIPLIERS = {
+    'Easy': {'revenue': 1.20, 'penalty': 0.10, 'variance': 0.02},
+    'Normal': {'revenue': 1.0, 'penalty': 0.25, 'variance': 0.05},
+    'Hard': {'revenue': 0.90, 'penalty': 0.35, 'variance': 0.08},
+    'Realistic': {'revenue': 0.80, 'penalty': 0.50, 'variance': 0.10}
+}
+
+# Built-in fallback coordinates; the Airport table (see airports.py) extends these
+APT_COORDS = {
+    'KPOC': (34.091, -117.781),
+    'KCRQ': (33.128, -117.279),
+    'KSBP': (35.236, -120.642),
+    'KSNA': (33.6757, -117.8682),
+    'KOKB': (33.2173, -117.353),
+    'KVNY': (34.2098, -118.4904),
+    'KRZS': (34.5113, -119.755),
+    'KMQO': (35.237, -120.642)  # placeholder MQO VOR approx same as KSBP for demo
+}
+
+_airport_index = AirportIndex((ident, lat, lon) for ident, (lat, lon) in APT_COORDS.items())
+
+
+def set_airport_index(rows):
+    """Rebuild the airport index from (ident, lat, lon) rows plus the built-in fallback.
+
+    Rows take precedence over APT_COORDS.
+    """
+    global _airport_index
+    fallback = ((ident, lat, lon) for ident, (lat, lon) in APT_COORDS.items())
+    _airport_index = AirportIndex(list(rows) + list(fallback))
+    return _airport_index
+
+
+def airport_index():
+    return _airport_index
+
+
+def route_distance_nm(departure, destination):
+    """Direct distance between two known airports, 0.0 if either is unknown."""
+    return _airport_index.distance_nm(departure, destination) or 0.0
+
+
+def waypoint_route_distance_nm(waypoints):
+    """Leg-by-leg distance along parsed flight plan waypoints.
+
+    Each waypoint dict may carry lat/lon (from the plan itself); otherwise its
+    ident is looked up in the airport index. Unresolvable waypoints are skipped.
+    Returns None when fewer than two points resolve.
+    """
+    points = []
+    for wp in waypoints or ():
+        lat, lon = wp.get('lat'), wp.get('lon')
+        if lat is None or lon is None:
+            pos = _airport_index.coords(wp.get('ident'))
+            if pos is None:
+                continue
+            lat, lon = pos
+        points.append((lat, lon))
+    if len(points) < 2:
+        return None
+    return sum(haversine_nm(a[0], a[1], b[0], b[1]) for a, b in zip(points, points[1:]))
+
+
+def economy_fingerprint(difficulty, fuel_variance, destination_penalty):
+    """Stable version string for the shared economy inputs (settings + constants)."""
+    fingerprint = {
+        'constants': ECONOMY_CONSTANTS,
+        'difficulty': difficulty,
+        'fuel_variance': fuel_variance,
+        'destination_penalty': destination_penalty
+    }
+    return hashlib.sha1(json.dumps(fingerprint, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def seeded_jitter(seed, variance):
+    """Deterministic jitter in [-variance, variance] derived from a seed string.
+
+    Replaces random.uniform so the same dispatch under the same settings always
+    books the same revenue.
+    """
+    digest = hashlib.sha256(str(seed).encode('utf-8')).digest()
+    unit = int.from_bytes(digest[:8], 'big') / float(1 << 64)  # [0, 1)
+    return (unit * 2.0 - 1.0) * variance
+
+
+def compute_financials(dispatch_id, settings_version, difficulty, payload_lbs, fuel_units,
+                       departure, destination, arrived_at_dest, has_crew_logs, route_nm=None):
+    """Compute (revenue, costs, profit, distance_nm) for a dispatch from plain inputs.
+
+    payload_lbs / fuel_units are already-resolved numbers (None treated as 0).
+    arrived_at_dest / has_crew_logs drive the missed-destination penalty.
+    route_nm is the stored flight plan route distance; when absent the direct
+    departure->destination great circle is used.
+    """
+    consts = ECONOMY_CONSTANTS
+    payload_lbs = float(payload_lbs or 0.0)
+    fuel_units = float(fuel_units or 0.0)
+    diff_params = DIFFICULTY_MULTIPLIERS.get(difficulty, DIFFICULTY_MULTIPLIERS['Normal'])
+    rev_base = consts['BASE_FLIGHT_REVENUE'] * diff_params['revenue']
+    payload_revenue = payload_lbs * consts['REVENUE_PER_LB']
+    fuel_cost = fuel_units * consts['FUEL_COST_PER_UNIT']
+    maintenance = consts['MAINTENANCE_FLAT']
+    if route_nm:
+        distance_nm = route_nm
+    else:
+        try:
+            distance_nm = route_distance_nm(departure, destination)
+        except Exception:
+            distance_nm = 0.0
+    distance_revenue = distance_nm * consts['REVENUE_PER_NM']
+
+    # Immersion/realism adjustments based on execution vs plan
+    penalty = 0.0
+    if has_crew_logs and not arrived_at_dest:
+        # Apply difficulty-based penalty if flight never reached planned destination
+        penalty += diff_params['penalty'] * (payload_revenue + distance_revenue)
+    # Small deterministic variance for immersion, seeded per dispatch + settings version
+    bonus_multiplier = 1.0 + seeded_jitter(f'{dispatch_id}:{settings_version}', diff_params['variance'])
+    # Apply multiplier to core revenue (base + payload + distance) then subtract penalties
+    core_revenue = rev_base + payload_revenue + distance_revenue
+    revenue = core_revenue * bonus_multiplier - penalty
+    costs = fuel_cost + maintenance
+    profit = revenue - costs
+    return round(revenue,2), round(costs,2), round(profit,2), round(distance_nm,1)
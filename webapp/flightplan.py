@@ -0,0 +1,257 @@
+"""Flight plan parsers for uploaded MSFS .pln files and SimBrief OFPs.
+
+Both parsers stream the XML with ElementTree.iterparse in a single pass:
+each waypoint / navlog fix is detached from the tree as soon as it has been
+consumed, so memory stays bounded by one waypoint rather than the document
+size, and parsing stops as soon as the interesting section has closed.
+
+Each parser returns the same dict shape (see empty_plan()).
+"""
+import io
+import re
+import xml.etree.ElementTree as ET
+
+_WORLD_POS_RE = re.compile(r'([NSEW])\s*(\d+)\D+?(\d+)\D+?([\d.]+)')
+
+
+def empty_plan():
+    """Parsed plan structure with every field unset."""
+    return {
+        'route_str': None,
+        'cruising_alt': None,
+        'departure_runway': None,
+        'arrival_runway': None,
+        'approach_type': None,
+        'waypoints': []
+    }
+
+
+def parse_world_position(text):
+    """Parse an MSFS WorldPosition ("N34° 5' 27.60\",W117° 46' 51.60\",+001011.00").
+
+    Returns (lat, lon) in decimal degrees, or (None, None) if unparseable.
+    """
+    if not text:
+        return None, None
+    lat = lon = None
+    for hemi, deg, minutes, sec in _WORLD_POS_RE.findall(text):
+        val = float(deg) + float(minutes) / 60.0 + float(sec) / 3600.0
+        if hemi in 'SW':
+            val = -val
+        if hemi in 'NS':
+            lat = val
+        else:
+            lon = val
+    if lat is None or lon is None:
+        return None, None
+    return lat, lon
+
+
+def _as_stream(content):
+    """Binary stream for iterparse from str, bytes or an already-open file object."""
+    if hasattr(content, 'read'):
+        return content
+    if isinstance(content, str):
+        # Some .pln files may have BOM or leading whitespace
+        content = content.lstrip('﻿ \t\r\n').encode('utf-8')
+    else:
+        content = content.lstrip(b'\xef\xbb\xbf \t\r\n')
+    return io.BytesIO(content)
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+def _text(elem, path):
+    el = elem.find(path)
+    if el is not None and el.text and el.text.strip():
+        return el.text.strip()
+    return None
+
+
+# Elements at this depth or shallower (root = 0) are detached once consumed; deeper
+# ones stay attached until their depth-2 ancestor (a waypoint / navlog fix) closes.
+DETACH_DEPTH = 2
+
+
+def _iter_elements(content):
+    """Yield (elem, parent) on each end event, detaching shallow elements afterwards."""
+    stack = []
+    for event, elem in ET.iterparse(_as_stream(content), events=('start', 'end')):
+        if event == 'start':
+            stack.append(elem)
+            continue
+        stack.pop()
+        parent = stack[-1] if stack else None
+        yield elem, parent
+        if parent is not None and len(stack) <= DETACH_DEPTH:
+            # Consumed elements are always the first remaining child, so this is O(1)
+            parent.remove(elem)
+
+
+def _compact_route(waypoints):
+    """Build a route string: include airway when it changes, then ident."""
+    prev_airway = None
+    route_parts = []
+    for wp in waypoints:
+        airway = wp.get('airway')
+        if airway and airway != prev_airway:
+            route_parts.append(airway)
+            prev_airway = airway
+        route_parts.append(wp['ident'])
+    if not route_parts:
+        return None
+    # De-duplicate consecutive identical idents (unlikely but safe)
+    compact = []
+    last = None
+    for part in route_parts:
+        if part != last:
+            compact.append(part)
+        last = part
+    return ' '.join(compact)
+
+
+def parse_pln(content):
+    """Parse a Microsoft Flight Simulator .pln XML document.
+
+    content may be str, bytes or a binary file object. Returns a dict with keys:
+      route_str: Reconstructed compact route string
+      cruising_alt: Cruise altitude (string or None)
+      departure_runway: e.g. '26L'
+      arrival_runway: e.g. '29'
+      approach_type: e.g. 'RNAV'
+      waypoints: list of dicts {ident, type, airway, lat, lon} (lat/lon None if absent)
+    Any missing values are None. Silently fails returning minimal dict if XML invalid.
+    """
+    data = empty_plan()
+    if not content:
+        return data
+    if isinstance(content, (str, bytes)):
+        marker = '<SimBase.Document' if isinstance(content, str) else b'<SimBase.Document'
+        if marker not in content:
+            return data
+    fp = None
+    try:
+        for event, elem in ET.iterparse(_as_stream(content), events=('start', 'end')):
+            if event == 'start':
+                # Remember <FlightPlan.FlightPlan> so its consumed children can be detached
+                if fp is None and elem.tag.endswith('FlightPlan') and elem.tag != 'SimBase.Document':
+                    fp = elem
+                continue
+            if fp is None:
+                continue
+            tag = elem.tag
+            if elem is fp:
+                break  # FlightPlan closed: nothing else in the document matters
+            if tag == 'ATCWaypoint':
+                ident = _text(elem, './ICAO/ICAOIdent')
+                if ident:
+                    lat, lon = parse_world_position(elem.findtext('WorldPosition'))
+                    data['waypoints'].append({
+                        'ident': ident,
+                        'type': _text(elem, 'ATCWaypointType'),
+                        'airway': _text(elem, 'ATCAirway'),
+                        'lat': lat,
+                        'lon': lon
+                    })
+                fp.remove(elem)
+            elif tag == 'CruisingAlt':
+                if elem.text and elem.text.strip():
+                    data['cruising_alt'] = elem.text.strip()
+            elif tag == 'DepartureDetails':
+                rn_val = _text(elem, 'RunwayNumberFP')
+                rd = _text(elem, 'RunwayDesignatorFP')
+                if rn_val:
+                    if rd and rd.upper() != 'NONE':
+                        rn_val += rd[0]  # Use first letter (e.g. LEFT -> L)
+                    data['departure_runway'] = rn_val
+            elif tag == 'ArrivalDetails':
+                rn_val = _text(elem, 'RunwayNumberFP')
+                if rn_val:
+                    data['arrival_runway'] = rn_val
+            elif tag == 'ApproachDetails':
+                at = _text(elem, 'ApproachTypeFP')
+                if at:
+                    data['approach_type'] = at
+    except ET.ParseError:
+        # Errors can only surface before FlightPlan closed (we stop reading there)
+        return empty_plan()
+    data['route_str'] = _compact_route(data['waypoints'])
+    return data
+
+
+def _float_or_none(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_simbrief(content):
+    """Parse a SimBrief OFP (XML, or the plain-text OFP as a fallback).
+
+    From the XML: route (<general><route> or <route_text>), initial altitude,
+    planned runways and the navlog fixes as waypoints, bracketed by the origin
+    and destination airports. Plain-text OFPs only yield the ROUTE line.
+    """
+    data = empty_plan()
+    if not content:
+        return data
+    text_probe = content if isinstance(content, str) else None
+    if text_probe is not None and '<' not in text_probe:
+        m_line = re.search(r'ROUTE:?\s*(.+)', text_probe)
+        data['route_str'] = m_line.group(1).strip() if m_line else None
+        return data
+    airports = {}
+    try:
+        for elem, parent in _iter_elements(content):
+            tag = _local(elem.tag)
+            ptag = _local(parent.tag) if parent is not None else None
+            if tag == 'route_text' and elem.text:
+                data['route_str'] = elem.text.strip()
+            elif ptag == 'general':
+                if tag == 'route' and elem.text and not data['route_str']:
+                    data['route_str'] = elem.text.strip()
+                elif tag == 'initial_altitude' and elem.text:
+                    data['cruising_alt'] = elem.text.strip()
+            elif ptag in ('origin', 'destination'):
+                # Airport fields close (and are detached) before their section does
+                apt = airports.setdefault(ptag, {'ident': None, 'type': 'apt', 'airway': None, 'lat': None, 'lon': None})
+                value = elem.text.strip() if elem.text and elem.text.strip() else None
+                if tag == 'icao_code':
+                    apt['ident'] = value
+                elif tag == 'pos_lat':
+                    apt['lat'] = _float_or_none(value)
+                elif tag == 'pos_long':
+                    apt['lon'] = _float_or_none(value)
+                elif tag == 'plan_rwy':
+                    data['departure_runway' if ptag == 'origin' else 'arrival_runway'] = value
+            elif tag == 'fix' and ptag == 'navlog':
+                ident = _text(elem, 'ident')
+                if ident:
+                    airway = _text(elem, 'via_airway')
+                    data['waypoints'].append({
+                        'ident': ident,
+                        'type': _text(elem, 'type'),
+                        'airway': None if airway in ('DCT', 'SID', 'STAR') else airway,
+                        'lat': _float_or_none(_text(elem, 'pos_lat')),
+                        'lon': _float_or_none(_text(elem, 'pos_long'))
+                    })
+            elif tag == 'navlog' and 'destination' in airports:
+                break  # origin, destination and navlog seen: the rest of the OFP is not needed
+    except ET.ParseError:
+        if text_probe is not None and not data['route_str']:
+            m_rt = re.search(r'<route_text>(.*?)</route_text>', text_probe, re.DOTALL)
+            m_line = m_rt or re.search(r'ROUTE:?\s*(.+)', text_probe)
+            data['route_str'] = m_line.group(1).strip() if m_line else None
+    wps = data['waypoints']
+    origin = airports.get('origin')
+    destination = airports.get('destination')
+    if origin and origin['ident'] and (not wps or wps[0]['ident'] != origin['ident']):
+        wps.insert(0, origin)
+    if destination and destination['ident'] and (not wps or wps[-1]['ident'] != destination['ident']):
+        wps.append(destination)
+    if not data['route_str']:
+        data['route_str'] = _compact_route(wps)
+    return data
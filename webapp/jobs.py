@@ -0,0 +1,220 @@
+"""Parser for the markdown flight jobs described in prompts/job_generation_prompt.md.
+
+A job is one markdown document with a Dispatch Release bullet list, a Cargo
+Manifest table and a Crew Log forecast. parse_job() turns it into plain dicts
+keyed by the DispatchRelease / CargoManifest / CrewLog column names (app.py links
+and inserts them) plus the integrity problems found; iter_job_files() reads jobs
+from a directory tree, a .zip or .tar(.gz) archive, or a single file. Nothing here
+knows about Flask or the models.
+"""
+import os
+import re
+import tarfile
+import zipfile
+
+_NUMBER_RE = re.compile(r'[-+]?\d[\d,]*(?:\.\d+)?')
+_BULLET_RE = re.compile(r'^\s*[-*]\s+((?:[^:(]|\([^)]*\))+):\s*(.*)$')  # label may hold '(hh:mm)'
+_BOLD_RE = re.compile(r'^\s*\*\*([^*]+?):?\*\*:?\s*(.*)$')
+_ICAO_RE = re.compile(r'^[A-Z0-9]{3,4}$')
+_DATE_RE = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+# Normalised bullet label -> dispatch column (labels are matched up to their first '(' or '/')
+DISPATCH_FIELDS = {
+    'flight id': 'flight_id',
+    'aircraft': 'aircraft',
+    'departure': 'departure',
+    'destination': 'destination',
+    'planned off-blocks': 'offblocks',
+    'planned arrival': 'arrival',
+    'route': 'route',
+    'alternate airports': 'alt_airports',
+    'weather brief': 'weather_brief',
+    'special notes': 'special_notes',
+    'planned payload': 'payload_planned',
+    'planned fuel': 'fuel_planned',
+}
+NUMERIC_FIELDS = ('payload_planned', 'fuel_planned')
+WEIGHT_TOLERANCE = 0.5  # lbs of rounding allowed between the cargo table and its stated total
+
+
+def parse_number(text):
+    """First number in text ("1,250 lbs" -> 1250.0), or None."""
+    m = _NUMBER_RE.search(text or '')
+    return float(m.group(0).replace(',', '')) if m else None
+
+
+def _label(text):
+    return re.split(r'[(/]', text, maxsplit=1)[0].strip().lower()
+
+
+def _sections(text):
+    """{lowercased '## ' heading: [lines]}, with the lines before the first heading under ''."""
+    sections = {'': []}
+    current = ''
+    for line in text.splitlines():
+        if line.startswith('## '):
+            current = _label(line[3:])
+            sections.setdefault(current, [])
+        else:
+            sections[current].append(line)
+    return sections
+
+
+def _bullets(lines):
+    out = {}
+    for line in lines:
+        m = _BULLET_RE.match(line)
+        if m:
+            out[_label(m.group(1))] = m.group(2).strip()
+    return out
+
+
+def _bold_fields(lines):
+    out = {}
+    for line in lines:
+        m = _BOLD_RE.match(line)
+        if m:
+            out[_label(m.group(1))] = m.group(2).strip()
+    return out
+
+
+def _cargo_items(lines):
+    """Rows of the cargo table as dicts (item, description, weight, handling); header and rule skipped."""
+    items = []
+    for line in lines:
+        if not line.strip().startswith('|'):
+            continue
+        cells = [c.strip() for c in line.strip().strip('|').split('|')]
+        if len(cells) < 3 or set(''.join(cells)) <= set('-: ') or cells[0].lower() == 'item':
+            continue
+        items.append({'item': cells[0], 'description': cells[1], 'weight': parse_number(cells[2]),
+                      'handling': cells[3] if len(cells) > 3 and cells[3] not in ('-', '—') else ''})
+    return items
+
+
+def parse_job(text):
+    """Parse one job document.
+
+    Returns a dict with 'dispatch', 'manifest' and 'crew' (column -> value, links
+    left to the caller), 'registration' (from the fleet check, else the last word
+    of the aircraft line) and 'errors', a list of missing fields and failed
+    integrity checks. A job with errors should not be imported.
+    """
+    sections = _sections(text)
+    head = _bold_fields(sections[''])
+    title = next((line[2:] for line in sections[''] if line.startswith('# ')), '')
+    errors = []
+    date = head.get('date', '').split()[0] if head.get('date') else ''
+
+    dispatch = {'date': date}
+    for label, value in _bullets(sections.get('dispatch release', [])).items():
+        column = DISPATCH_FIELDS.get(label)
+        if column:
+            dispatch[column] = parse_number(value) if column in NUMERIC_FIELDS else value
+    if not dispatch.get('flight_id') and ':' in title:
+        dispatch['flight_id'] = title.split(':', 1)[1].strip()
+    for column in ('departure', 'destination'):
+        if dispatch.get(column):
+            dispatch[column] = dispatch[column].split()[0].upper()
+
+    cargo_lines = sections.get('cargo manifest', [])
+    items = _cargo_items(cargo_lines)
+    totals = _bold_fields(cargo_lines)
+    total_weight = parse_number(totals.get('total cargo weight'))
+    pieces = parse_number(totals.get('total pieces'))
+    item_sum = sum(i['weight'] or 0.0 for i in items)
+    if total_weight is None and items:
+        total_weight = item_sum
+    manifest = {
+        'date': date,
+        'departure': dispatch.get('departure'),
+        'arrival': dispatch.get('destination'),
+        'total_weight': total_weight,
+        'pieces': int(pieces) if pieces is not None else len(items) or None,
+        'notes': '\n'.join(f"{i['item']}. {i['description']} - {i['weight']:g} lbs"
+                           + (f" ({i['handling']})" if i['handling'] else '')
+                           for i in items if i['weight'] is not None) or None,
+    }
+    if items:
+        dispatch['cargo_plan'] = '; '.join(f"{i['description']} ({i['weight']:g} lbs)"
+                                           for i in items if i['weight'] is not None)
+
+    crew_fields = _bullets(sections.get('crew log', []))
+    remarks = ['Forecast from imported job.']
+    for label, caption in (('pilot in command', 'PIC'), ('second crew', 'Second crew'),
+                           ('estimated air time', 'Estimated air time')):
+        if crew_fields.get(label) and crew_fields[label].upper() != 'N/A':
+            remarks.append(f'{caption}: {crew_fields[label]}.')
+    crew = {
+        'date': date,
+        'flight_id': dispatch.get('flight_id'),
+        'origin': dispatch.get('departure'),
+        'destination': dispatch.get('destination'),
+        'aircraft': dispatch.get('aircraft'),
+        'block_off': dispatch.get('offblocks'),
+        'block_on': dispatch.get('arrival'),
+        'block_time': crew_fields.get('estimated block time'),
+        'cargo_weight': total_weight,
+        'remarks': ' '.join(remarks),
+        'forecast': 1,
+    }
+
+    for column in ('flight_id', 'departure', 'destination', 'payload_planned', 'fuel_planned'):
+        if dispatch.get(column) in (None, ''):
+            errors.append(f'dispatch: missing {column}')
+    if not _DATE_RE.match(date):
+        errors.append(f'date: expected YYYY-MM-DD, got {date!r}')
+    for column in ('departure', 'destination'):
+        if dispatch.get(column) and not _ICAO_RE.match(dispatch[column]):
+            errors.append(f'dispatch: {column} {dispatch[column]!r} is not an ICAO code')
+    if dispatch.get('departure') and dispatch.get('departure') == dispatch.get('destination'):
+        errors.append('dispatch: departure and destination are the same')
+    if not items:
+        errors.append('cargo: no items in the manifest table')
+    elif any(i['weight'] is None for i in items):
+        errors.append('cargo: item without a weight')
+    elif abs(item_sum - total_weight) > WEIGHT_TOLERANCE:
+        errors.append(f'cargo: items add up to {item_sum:g} lbs, total says {total_weight:g}')
+    if total_weight is not None and dispatch.get('payload_planned') is not None \
+            and total_weight > dispatch['payload_planned'] + WEIGHT_TOLERANCE:
+        errors.append(f"cargo: {total_weight:g} lbs exceeds planned payload {dispatch['payload_planned']:g}")
+
+    aircraft = dispatch.get('aircraft') or ''
+    registration = _bullets(sections.get('fleet & performance check', [])).get('registration') \
+        or (aircraft.split()[-1] if aircraft.split() else None)
+    return {
+        'dispatch': dispatch,
+        'manifest': manifest,
+        'crew': crew,
+        'registration': registration.upper() if registration else None,
+        'errors': errors,
+    }
+
+
+def _decode(data):
+    return data.decode('utf-8-sig', errors='replace')
+
+
+def iter_job_files(path):
+    """Yield (name, text) for every .md job under a directory, in a .zip / .tar(.gz) archive, or a single file."""
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith('.md'):
+                    full = os.path.join(root, name)
+                    with open(full, 'rb') as fh:
+                        yield os.path.relpath(full, path), _decode(fh.read())
+    elif zipfile.is_zipfile(path):
+        with zipfile.ZipFile(path) as zf:
+            for info in zf.infolist():
+                if not info.is_dir() and info.filename.lower().endswith('.md'):
+                    yield info.filename, _decode(zf.read(info))
+    elif tarfile.is_tarfile(path):
+        with tarfile.open(path) as tf:
+            for member in tf:
+                if member.isfile() and member.name.lower().endswith('.md'):
+                    yield member.name, _decode(tf.extractfile(member).read())
+    else:
+        with open(path, 'rb') as fh:
+            yield os.path.basename(path), _decode(fh.read())
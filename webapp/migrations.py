@@ -0,0 +1,325 @@
+"""Versioned schema migrations for the Palm Route Air database.
+
+The applied version is recorded in a one-row ``schema_version`` table. Nothing
+here runs at import time: ``flask --app app upgrade-db`` (or ``python app.py``)
+calls upgrade(), which is a single SELECT when the database is already current.
+
+Migrations are plain functions taking a SQLAlchemy Connection and a log
+callable, registered in order with @migration(version, description). They use
+raw SQL only, so this module never imports the models. A brand-new database is built straight from
+the model metadata and stamped with the head version; older databases (tables
+present but no version recorded) start at version 0 and replay every step.
+Versions are never reused: a step that is withdrawn leaves a gap in the numbering.
+
+Introspection goes through SQLAlchemy's inspector so the same steps run on
+SQLite and PostgreSQL; the few dialect-specific operations (SQLite's table
+rebuild, typeof() checks) branch on conn.dialect.name.
+"""
+import datetime
+import re
+
+from sqlalchemy import Column, Integer, MetaData, Table, Text, inspect, text
+
+VERSION_TABLE = 'schema_version'
+
+MIGRATIONS = []
+
+
+def migration(version, description):
+    """Register fn(conn, log) as the step that brings the schema to `version`."""
+    def register(fn):
+        if MIGRATIONS and version <= MIGRATIONS[-1][0]:
+            raise ValueError(f'Migration {version} registered out of order')
+        MIGRATIONS.append((version, description, fn))
+        return fn
+    return register
+
+
+def head_version():
+    return MIGRATIONS[-1][0] if MIGRATIONS else 0
+
+
+def _table_names(conn):
+    return set(inspect(conn).get_table_names())
+
+
+def _index_names(conn, table):
+    if conn.dialect.name == 'sqlite':  # the inspector skips expression indexes on SQLite
+        return {row[0] for row in conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :t"), {'t': table})}
+    return {ix['name'] for ix in inspect(conn).get_indexes(table)}
+
+
+def _columns(conn, table):
+    """Column names of a table in declaration order."""
+    return [col['name'] for col in inspect(conn).get_columns(table)]
+
+
+def _alter_types(conn, table, types):
+    """Change column types in place (PostgreSQL and other servers with ALTER COLUMN TYPE).
+
+    Existing values are dropped (USING NULL); callers write the converted values back.
+    """
+    sql_types = {'FLOAT': 'DOUBLE PRECISION'}
+    for col, sql_type in types.items():
+        conn.execute(text(f'ALTER TABLE {table} ALTER COLUMN {col} TYPE {sql_types.get(sql_type, sql_type)} '
+                          'USING NULL'))
+
+
+def _rebuild_with_types(conn, table, types):
+    """Change column types by rebuilding the table (SQLite cannot ALTER a column type).
+
+    types maps column -> new SQL type. Follows SQLite's documented procedure:
+    create the new table under a temporary name, copy the rows, drop the old one
+    and rename, so foreign keys in other tables keep pointing at `table`.
+    Indexes are recreated from their original DDL.
+    """
+    create_sql = conn.execute(text("SELECT sql FROM sqlite_master WHERE type='table' AND name=:t"),
+                              {'t': table}).scalar()
+    index_sql = [row[0] for row in conn.execute(
+        text("SELECT sql FROM sqlite_master WHERE type='index' AND tbl_name=:t AND sql IS NOT NULL"), {'t': table})]
+    tmp = f'{table}__new'
+    new_sql, found = re.subn(rf'^CREATE TABLE\s+("?){table}\1', f'CREATE TABLE {tmp}', create_sql)
+    if not found:
+        raise RuntimeError(f'Unexpected DDL for {table}: {create_sql[:80]}')
+    for col, sql_type in types.items():
+        # Matches both create_all's "\n\tcol VARCHAR(20)" and ADD COLUMN's appended ", col TEXT"
+        new_sql, found = re.subn(rf'([(,]\s*"?{col}"?\s+)[A-Z]+(?:\(\d+\))?', rf'\g<1>{sql_type}', new_sql)
+        if not found:
+            raise RuntimeError(f'Column {table}.{col} not found')
+    conn.execute(text(new_sql))
+    cols = ', '.join(f'"{c}"' for c in _columns(conn, table))
+    conn.execute(text(f'INSERT INTO {tmp} ({cols}) SELECT {cols} FROM {table}'))
+    conn.execute(text(f'DROP TABLE {table}'))
+    conn.execute(text(f'ALTER TABLE {tmp} RENAME TO {table}'))
+    for sql in index_sql:
+        conn.execute(text(sql))
+
+
+_LEGACY_NUMBER_RE = re.compile(r'^([-+]?(?:\d[\d,]*)?\.?\d+)\s*[A-Za-z.]*$')
+
+
+def parse_legacy_number(raw):
+    """Best-effort number from free-text legacy input ("1,250", "680 lbs", " 26.5 ").
+
+    Returns None when the value cannot be read as a number.
+    """
+    m = _LEGACY_NUMBER_RE.match(str(raw).strip())
+    if not m:
+        return None
+    try:
+        return float(m.group(1).replace(',', ''))
+    except ValueError:
+        return None
+
+
+def _add_columns(conn, table, columns):
+    """ALTER TABLE ADD COLUMN for each (name, ddl) not already present."""
+    existing = _columns(conn, table)
+    for col, ddl in columns.items():
+        if col not in existing:
+            conn.execute(text(f'ALTER TABLE {table} ADD COLUMN {col} {ddl}'))
+
+
+def current_version(conn):
+    """Applied schema version, or None when the version table does not exist yet."""
+    if VERSION_TABLE not in _table_names(conn):
+        return None
+    row = conn.execute(text(f'SELECT version FROM {VERSION_TABLE}')).first()
+    return row[0] if row else 0
+
+
+def _stamp(conn, version):
+    conn.execute(text(f'DELETE FROM {VERSION_TABLE}'))
+    conn.execute(text(f'INSERT INTO {VERSION_TABLE} (version) VALUES (:v)'), {'v': version})
+
+
+def pending(conn):
+    """(version, description) of every migration not yet applied."""
+    version = current_version(conn) or 0
+    return [(v, desc) for v, desc, _fn in MIGRATIONS if v > version]
+
+
+def upgrade(engine, metadata, log=print):
+    """Bring the database up to head_version(). Returns the list of versions applied.
+
+    Runs in one transaction: a failing step leaves the schema at its previous
+    version. Tables missing from older databases are created from metadata
+    before the steps run; model-declared indexes are ensured afterwards.
+    """
+    with engine.connect() as conn:
+        version = current_version(conn)
+        if version is not None and version >= head_version():
+            return []
+    applied = []
+    with engine.begin() as conn:
+        fresh = not (_table_names(conn) - {VERSION_TABLE})
+        conn.execute(text(f'CREATE TABLE IF NOT EXISTS {VERSION_TABLE} (version INTEGER NOT NULL)'))
+        metadata.create_all(conn)
+        if fresh:
+            log(f'Created schema at version {head_version()}')
+        else:
+            start = current_version(conn) or 0
+            for v, desc, fn in MIGRATIONS:
+                if v <= start:
+                    continue
+                log(f'Applying migration {v}: {desc}')
+                fn(conn, log)
+                applied.append(v)
+        # create_all skips tables that already exist, so their new indexes land here
+        for table in metadata.sorted_tables:
+            existing = _index_names(conn, table.name)
+            for index in table.indexes:
+                if index.name not in existing:
+                    index.create(bind=conn)
+        _stamp(conn, head_version())
+    return applied
+
+
+# --- Migrations -----------------------------------------------------------
+
+@migration(1, 'columns previously added by the import-time ALTER TABLE block')
+def _legacy_runtime_columns(conn, log):
+    _add_columns(conn, 'dispatch_release', {
+        'payload_planned': 'TEXT',
+        'fuel_planned': 'TEXT',
+        'cargo_plan': 'TEXT',
+        'alt_airports': 'TEXT',
+        'weather_brief': 'TEXT',
+        'special_notes': 'TEXT',
+        'actual_cargo_weight': 'TEXT',
+        'fleet_entry_id': 'INTEGER',
+        'flight_plan_raw': 'TEXT',
+        'flight_plan_source': 'TEXT',
+        'briefing_pdf_filename': 'TEXT',
+        'completed': 'INTEGER',
+    })
+    _add_columns(conn, 'cargo_manifest', {'dispatch_release_id': 'INTEGER'})
+    _add_columns(conn, 'app_settings', {'show_workflow_help': 'INTEGER DEFAULT 1'})
+    _add_columns(conn, 'crew_log', {'fuel_used': 'TEXT'})
+
+
+@migration(2, 'stored flight plan hash, parsed JSON and route distance')
+def _stored_flight_plans(conn, log):
+    _add_columns(conn, 'dispatch_release', {
+        'flight_plan_hash': 'TEXT',
+        'route_distance_nm': 'REAL',
+        'flight_plan_parsed': 'TEXT',
+    })
+
+
+# Raw values migration 3 could not read as numbers, kept for manual review
+legacy_numeric_value = Table(
+    'legacy_numeric_value', MetaData(),
+    Column('id', Integer, primary_key=True),
+    Column('table_name', Text, nullable=False),
+    Column('row_id', Integer, nullable=False),
+    Column('column_name', Text, nullable=False),
+    Column('raw_value', Text),
+)
+
+# Free-text columns converted to numbers by migration 3: table -> {column: SQL type}
+NUMERIC_COLUMNS = {
+    'cargo_manifest': {'total_weight': 'FLOAT', 'pieces': 'INTEGER'},
+    'dispatch_release': {'payload_planned': 'FLOAT', 'fuel_planned': 'FLOAT', 'actual_cargo_weight': 'FLOAT'},
+    'crew_log': {'cargo_weight': 'FLOAT', 'fuel_used': 'FLOAT'},
+    'fleet_entry': {'max_takeoff_weight': 'FLOAT', 'useful_load': 'FLOAT'},
+}
+
+
+@migration(3, 'numeric weight, fuel and payload columns (unparseable values kept in legacy_numeric_value)')
+def _numeric_columns(conn, log):
+    legacy_numeric_value.create(conn, checkfirst=True)
+    sqlite = conn.dialect.name == 'sqlite'
+    unparseable = 0
+    for table, types in NUMERIC_COLUMNS.items():
+        if sqlite:
+            _rebuild_with_types(conn, table, types)
+            # Copying into a numeric column converts well-formed numbers; whatever is still text needs a look
+            pending_values = {col: conn.execute(text(f"SELECT id, {col} FROM {table} WHERE typeof({col}) = 'text'"))
+                              .fetchall() for col in types}
+        else:
+            # ALTER ... TYPE rejects non-numeric text, so read everything first and write it back parsed
+            pending_values = {col: conn.execute(text(f'SELECT id, CAST({col} AS TEXT) FROM {table} '
+                                                     f'WHERE {col} IS NOT NULL')).fetchall() for col in types}
+            _alter_types(conn, table, types)
+        for col, sql_type in types.items():
+            for row_id, raw in pending_values[col]:
+                value = parse_legacy_number(raw) if raw.strip() else None
+                if value is None and raw.strip():
+                    unparseable += 1
+                    log(f'  {table}#{row_id}.{col}: could not parse {raw!r}, cleared')
+                    conn.execute(legacy_numeric_value.insert().values(
+                        table_name=table, row_id=row_id, column_name=col, raw_value=raw))
+                elif value is not None and sql_type == 'INTEGER':
+                    value = int(round(value))
+                conn.execute(text(f'UPDATE {table} SET {col} = :v WHERE id = :id'), {'v': value, 'id': row_id})
+    if unparseable:
+        log(f'  {unparseable} unparseable value(s) cleared; originals kept in legacy_numeric_value')
+
+
+@migration(4, 'recompute dispatch actual_cargo_weight (maintained incrementally from now on)')
+def _backfill_actual_cargo_weight(conn, log):
+    conn.execute(text(
+        'UPDATE dispatch_release SET actual_cargo_weight = ('
+        'SELECT NULLIF(ROUND(CAST(SUM(total_weight) AS NUMERIC), 3), 0) FROM cargo_manifest '
+        'WHERE cargo_manifest.dispatch_release_id = dispatch_release.id)'))
+
+
+@migration(6, 'change_version counters for the page cache')
+def _change_versions(conn, log):
+    existing = {row[0] for row in conn.execute(text('SELECT table_name FROM change_version'))}
+    for table in sorted(_table_names(conn) - existing - {VERSION_TABLE, 'change_version'}):
+        conn.execute(text('INSERT INTO change_version (table_name, version) VALUES (:t, 0)'), {'t': table})
+
+
+@migration(7, 'ledger_checkpoint table; balance derived from transactions (drift booked as an opening adjustment)')
+def _ledger_checkpoints(conn, log):
+    stored = conn.execute(text('SELECT balance FROM company_account ORDER BY id LIMIT 1')).scalar()
+    derived = conn.execute(text(
+        "SELECT COALESCE(SUM(CASE WHEN type = 'revenue' THEN amount ELSE -amount END), 0) FROM \"transaction\""
+    )).scalar()
+    drift = (stored or 0.0) - float(derived)
+    if abs(drift) >= 0.01:
+        log(f'  account balance {stored:.2f} differs from the transactions ({derived:.2f}); '
+            f'posting a {drift:+.2f} opening adjustment')
+        conn.execute(text('INSERT INTO "transaction" (timestamp, type, amount, description) '
+                          'VALUES (:ts, :type, :amount, :description)'), {
+            'ts': datetime.datetime.utcnow(), 'type': 'revenue' if drift > 0 else 'expense', 'amount': abs(drift),
+            'description': 'Opening balance adjustment (account balance before the ledger)'})
+
+
+@migration(8, 'ledger (timestamp, id) index for paging replaces the timestamp-only index; '
+              'SQLite period-label indexes for the totals')
+def _ledger_paging_index(conn, log):
+    # upgrade() creates the replacement indexes from the model once the steps have run
+    conn.execute(text('DROP INDEX IF EXISTS ix_transaction_timestamp'))
+
+
+@migration(9, 'transaction.incident_id (backfilled from incident descriptions) for the reports')
+def _transaction_incident_link(conn, log):
+    if 'incident_id' not in _columns(conn, 'transaction'):
+        conn.execute(text('ALTER TABLE "transaction" ADD COLUMN incident_id INTEGER REFERENCES incident (id)'))
+    matched = conn.execute(text(
+        'UPDATE "transaction" SET incident_id = (SELECT MIN(i.id) FROM incident i '
+        "WHERE 'Incident: ' || COALESCE(i.title, 'Unnamed') = \"transaction\".description "
+        'AND COALESCE(i.dispatch_release_id, 0) = COALESCE("transaction".dispatch_release_id, 0)) '
+        "WHERE description LIKE 'Incident: %' AND incident_id IS NULL")).rowcount
+    if matched:
+        log(f'  {matched} incident expense(s) matched against incidents by title and dispatch')
+
+
+@migration(11, 'crew_log.forecast flag (backfilled for crew logs created by the job importer)')
+def _crew_log_forecast(conn, log):
+    _add_columns(conn, 'crew_log', {'forecast': 'INTEGER NOT NULL DEFAULT 0'})
+    marked = conn.execute(text(
+        "UPDATE crew_log SET forecast = 1 "
+        "WHERE remarks LIKE 'Forecast from imported job.%' AND fuel_used IS NULL")).rowcount
+    if marked:
+        log(f'  {marked} imported crew log(s) marked as forecast')
+
+
+@migration(12, 'crew_log.created_at so report refreshes only claim settled crew logs')
+def _crew_log_created_at(conn, log):
+    # Existing crew logs keep NULL: they are long settled
+    _add_columns(conn, 'crew_log', {'created_at': 'TIMESTAMP'})
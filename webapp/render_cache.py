@@ -0,0 +1,95 @@
+"""Server-side cache for rendered pages.
+
+Entries are opaque byte strings stored under keys built by the caller. app.py builds
+each key from the route, its arguments, the viewer and the change versions of the
+tables the page reads, so a write makes older entries unreachable instead of
+deleting them. Nothing here knows about Flask or the models.
+
+Backends share two methods, get(key) -> bytes | None and set(key, value):
+  MemoryRenderCache: per-process LRU capped by total size (default)
+  RedisRenderCache:  shared between workers; needs the optional `redis` package
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def cache_key(*parts):
+    """Stable digest of the key parts (also used as the page's ETag)."""
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+class MemoryRenderCache:
+    """Thread-safe LRU of rendered pages, evicting the least recently used past max_bytes."""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        if len(value) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = value
+            self._size += len(value)
+            while self._size > self.max_bytes:
+                _key, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisRenderCache:
+    """Pages kept in Redis so every worker shares them; entries expire after ttl seconds."""
+
+    def __init__(self, url, ttl=3600, prefix='pra:page:'):
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError('RedisRenderCache needs the redis package (pip install redis)') from exc
+        self._client = redis.Redis.from_url(url)
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key):
+        return self._client.get(self.prefix + key)
+
+    def set(self, key, value):
+        self._client.set(self.prefix + key, value, ex=self.ttl)
+
+    def clear(self):
+        for key in self._client.scan_iter(self.prefix + '*'):
+            self._client.delete(key)
+
+
+def make_render_cache(spec, max_bytes=32 * 1024 * 1024):
+    """Backend for a config value: 'memory', 'off' (None) or a redis:// URL."""
+    if not spec or spec == 'off':
+        return None
+    if spec == 'memory':
+        return MemoryRenderCache(max_bytes)
+    if spec.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisRenderCache(spec)
+    raise ValueError(f'Unknown render cache backend {spec!r}')
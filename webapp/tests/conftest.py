@@ -0,0 +1,63 @@
+"""Shared fixtures: a throwaway database migrated and seeded for every test.
+
+The tests run against SQLite in a temporary directory unless DATABASE_URL points
+at another server (the CI PostgreSQL job does). app.py reads its configuration on
+import, so the environment is set before it is imported.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+_tmp = tempfile.TemporaryDirectory()
+if not os.environ.get('DATABASE_URL'):
+    os.environ['PRA_DB_PATH'] = os.path.join(_tmp.name, 'test.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as pra  # noqa: E402  (must follow the environment)
+
+ADMIN = ('admin@palmroute.local', 'pilot')
+
+
+@pytest.fixture
+def app():
+    """The app module with a freshly migrated and seeded database.
+
+    No app context stays pushed, so every request gets its own session as in
+    production; wrap direct database work in app.app.app_context().
+    """
+    pra.app.config['TESTING'] = True
+    with pra.app.app_context():
+        pra.db.drop_all()
+        with pra.db.engine.begin() as conn:
+            conn.execute(pra.db.text(f'DROP TABLE IF EXISTS {pra.migrations.VERSION_TABLE}'))
+        pra.init_database(log=lambda *_a: None)
+    pra.invalidate_settings_cache()
+    pra.invalidate_dashboard_totals()
+    if pra.page_cache is not None:
+        pra.page_cache.clear()
+    return pra
+
+
+def add_employee(app, role, email=None, password='secret'):
+    """Create an employee with the given role; returns its id."""
+    with app.app.app_context():
+        emp = app.Employee(name=f'Test {role}', email=email or f'{role.lower()}@test.local', role=role)
+        emp.set_password(password)
+        app.db.session.add(emp)
+        app.db.session.commit()
+        return emp.id
+
+
+def login(app, email=ADMIN[0], password=ADMIN[1]):
+    client = app.app.test_client()
+    response = client.post('/login', data={'email': email, 'password': password})
+    assert response.status_code == 302, response.status_code
+    return client
+
+
+@pytest.fixture
+def client(app):
+    """Test client logged in as the bootstrap administrator."""
+    return login(app)
@@ -0,0 +1,17 @@
+"""The airport index finds the nearest field on either side of the antimeridian."""
+import airports
+
+
+def test_nearest_searches_across_the_antimeridian():
+    index = airports.AirportIndex([('WEST', 0.0, 179.8), ('EAST', 0.0, -179.9)])
+    assert index.nearest(0.0, 179.99, max_nm=20)[0] == 'EAST'
+    assert index.nearest(0.0, -179.99, max_nm=20)[0] == 'EAST'
+    assert index.nearest(0.0, 180.0, max_nm=20)[0] == 'EAST'
+    assert index.nearest(0.0, -179.5, max_nm=30)[0] == 'EAST'
+    assert index.nearest(0.0, 179.85, max_nm=20)[0] == 'WEST'
+
+
+def test_nearest_respects_the_radius():
+    index = airports.AirportIndex([('KPOC', 34.091, -117.781)])
+    assert index.nearest(34.1, -117.8, max_nm=5)[0] == 'KPOC'
+    assert index.nearest(35.5, -117.8, max_nm=50) is None
@@ -0,0 +1,36 @@
+"""API writes need the same roles as the forms that make the same change."""
+import pytest
+
+from conftest import add_employee, login
+
+
+@pytest.fixture
+def pilot(app):
+    add_employee(app, 'Pilot', email='pilot@test.local')
+    return login(app, 'pilot@test.local', 'secret')
+
+
+def _first_id(app, model):
+    with app.app.app_context():
+        return model.query.first().id
+
+
+def test_pilot_cannot_patch_crew_logs(app, pilot):
+    log_id = _first_id(app, app.CrewLog)
+    response = pilot.patch('/api/v1/crew_logs', json=[{'id': log_id, 'fuel_used': 1}])
+    assert response.status_code == 403
+
+
+def test_pilot_can_create_crew_logs(app, pilot):
+    response = pilot.post('/api/v1/crew_logs', json=[{'date': '2026-04-01', 'origin': 'KPOC', 'destination': 'KCRQ'}])
+    assert response.status_code == 201
+
+
+@pytest.mark.parametrize('method', ['post', 'patch'])
+def test_dispatch_completed_is_not_writable(app, client, method):
+    record = {'date': '2026-04-01', 'departure': 'KPOC', 'destination': 'KCRQ', 'completed': 1}
+    if method == 'patch':
+        record = {'id': _first_id(app, app.DispatchRelease), 'completed': 1}
+    response = getattr(client, method)('/api/v1/dispatch_releases', json=[record])
+    assert response.status_code == 400
+    assert response.get_json()['details'] == ['[0].completed: not a writable field']
@@ -0,0 +1,83 @@
+"""A dispatch's actual cargo weight is the sum of its linked manifests, kept current on flush."""
+
+
+def _dispatch(app, flight_id):
+    with app.app.app_context(), app.unit_of_work():
+        dispatch = app.DispatchRelease(date='2026-05-02', flight_id=flight_id, departure='KPOC', destination='KCRQ')
+        app.db.session.add(dispatch)
+        app.db.session.flush()
+        return dispatch.id
+
+
+def _manifest(app, dispatch_id, weight):
+    with app.app.app_context(), app.unit_of_work():
+        manifest = app.CargoManifest(date='2026-05-02', departure='KPOC', arrival='KCRQ',
+                                     total_weight=weight, pieces=1, dispatch_release_id=dispatch_id)
+        app.db.session.add(manifest)
+        app.db.session.flush()
+        return manifest.id
+
+
+def _change(app, manifest_id, **values):
+    with app.app.app_context(), app.unit_of_work():
+        manifest = app.db.session.get(app.CargoManifest, manifest_id)
+        for name, value in values.items():
+            setattr(manifest, name, value)
+
+
+def _weight(app, dispatch_id):
+    with app.app.app_context():
+        weight = app.db.session.get(app.DispatchRelease, dispatch_id).actual_cargo_weight
+        summed = app.db.session.scalar(app.db.select(app.db.func.sum(app.CargoManifest.total_weight))
+                                       .where(app.CargoManifest.dispatch_release_id == dispatch_id))
+        assert weight == summed  # both NULL once nothing is linked
+        return weight
+
+
+def test_linking_and_editing_manifests(app):
+    dispatch_id = _dispatch(app, 'PRA901')
+    assert _weight(app, dispatch_id) is None
+    first = _manifest(app, dispatch_id, 500.0)
+    _manifest(app, dispatch_id, 250.5)
+    assert _weight(app, dispatch_id) == 750.5
+    _change(app, first, total_weight=420.0)
+    assert _weight(app, dispatch_id) == 670.5
+
+
+def test_unlinking_and_deleting_manifests(app):
+    dispatch_id = _dispatch(app, 'PRA902')
+    first = _manifest(app, dispatch_id, 500.0)
+    second = _manifest(app, dispatch_id, 250.0)
+    _change(app, first, dispatch_release_id=None)
+    assert _weight(app, dispatch_id) == 250.0
+    with app.app.app_context(), app.unit_of_work():
+        app.db.session.delete(app.db.session.get(app.CargoManifest, second))
+    assert _weight(app, dispatch_id) is None
+    _change(app, first, dispatch_release_id=dispatch_id)
+    assert _weight(app, dispatch_id) == 500.0
+
+
+def test_moving_a_manifest_between_dispatches(app):
+    source, target = _dispatch(app, 'PRA903'), _dispatch(app, 'PRA904')
+    manifest_id = _manifest(app, source, 500.0)
+    _manifest(app, target, 100.0)
+    _change(app, manifest_id, dispatch_release_id=target, total_weight=600.0)
+    assert _weight(app, source) is None
+    assert _weight(app, target) == 700.0
+    with app.app.app_context(), app.unit_of_work():
+        # With both dispatches loaded the deltas go through the ORM instead of a bare UPDATE
+        app.db.session.get(app.DispatchRelease, source)
+        app.db.session.get(app.DispatchRelease, target)
+        app.db.session.get(app.CargoManifest, manifest_id).dispatch_release_id = source
+    assert _weight(app, source) == 600.0
+    assert _weight(app, target) == 100.0
+
+
+def test_manifest_flushed_with_its_new_dispatch(app):
+    with app.app.app_context(), app.unit_of_work():
+        dispatch_id = app.db.session.scalar(app.db.select(app.db.func.max(app.DispatchRelease.id))) + 1
+        app.db.session.add(app.DispatchRelease(id=dispatch_id, date='2026-05-02', flight_id='PRA905',
+                                               departure='KPOC', destination='KCRQ'))
+        app.db.session.add(app.CargoManifest(date='2026-05-02', total_weight=320.0, pieces=4,
+                                             dispatch_release_id=dispatch_id))
+    assert _weight(app, dispatch_id) == 320.0
@@ -0,0 +1,65 @@
+"""Change versions move once per committed transaction; the dashboard recounts after them."""
+from sqlalchemy import event
+
+
+def _version(app, table):
+    with app.app.app_context():
+        return app.change_versions()[table]
+
+
+def test_versions_bump_once_per_commit(app):
+    before = _version(app, 'company_notam')
+    with app.app.app_context():
+        for i in range(3):
+            app.db.session.add(app.CompanyNotam(notam_id=f'N{i}', subject='Runway closed'))
+            app.db.session.flush()
+        assert app.change_versions()['company_notam'] == before  # nothing bumped before the commit
+        app.db.session.commit()
+    assert _version(app, 'company_notam') == before + 1
+
+
+def test_writes_flushed_by_the_commit_bump(app):
+    before = _version(app, 'company_notam')
+    with app.app.app_context():
+        app.db.session.add(app.CompanyNotam(notam_id='Unflushed', subject='Runway closed'))
+        app.db.session.commit()
+    assert _version(app, 'company_notam') == before + 1
+
+
+def test_versions_commit_with_the_data(app):
+    before = _version(app, 'company_notam')
+    with app.app.app_context():
+        engine = app.db.engine
+    transactions = []
+
+    def on_begin(conn):
+        transactions.append(conn)
+
+    event.listen(engine, 'begin', on_begin)
+    try:
+        with app.app.app_context():
+            app.db.session.add(app.CompanyNotam(notam_id='N1', subject='Runway closed'))
+            app.db.session.commit()
+    finally:
+        event.remove(engine, 'begin', on_begin)
+    assert len(transactions) == 1  # no second transaction for the bump
+    assert _version(app, 'company_notam') == before + 1
+
+
+def test_rolled_back_writes_do_not_bump(app):
+    before = _version(app, 'company_notam')
+    with app.app.app_context():
+        app.db.session.add(app.CompanyNotam(notam_id='Dropped', subject='Runway closed'))
+        app.db.session.flush()
+        app.db.session.rollback()
+        app.db.session.commit()
+    assert _version(app, 'company_notam') == before
+
+
+def test_dashboard_totals_follow_commits(app):
+    with app.app.app_context():
+        totals = app.dashboard_totals()
+        app.db.session.add(app.Incident(date='2026-03-01', title='Tail strike', estimated_cost=120.0, resolved=0))
+        app.db.session.commit()
+        assert app.dashboard_totals()['incidents'] == totals['incidents'] + 1
+        assert app.dashboard_totals()['open_incident_cost'] == totals['open_incident_cost'] + 120.0
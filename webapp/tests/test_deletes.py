@@ -0,0 +1,86 @@
+"""Deleting a record releases the rows that reference it, with foreign keys enforced."""
+import pytest
+from sqlalchemy import event
+
+
+@pytest.fixture
+def enforce_foreign_keys(app):
+    """Make SQLite check foreign keys like PostgreSQL does (it ignores them by default)."""
+    with app.app.app_context():
+        engine = app.db.engine
+    if engine.dialect.name != 'sqlite':
+        yield
+        return
+
+    def on_connect(dbapi_conn, _record):
+        dbapi_conn.execute('PRAGMA foreign_keys=ON')
+
+    event.listen(engine, 'connect', on_connect)
+    engine.dispose()
+    yield
+    event.remove(engine, 'connect', on_connect)
+    engine.dispose()
+
+
+def _linked_dispatch(app):
+    """A dispatch with a manifest, a signed-off crew log, an incident and ledger entries."""
+    with app.app.app_context(), app.unit_of_work():
+        emp = app.Employee.query.first()
+        d = app.DispatchRelease(date='2026-02-01', flight_id='DEL1', departure='KPOC', destination='KCRQ',
+                                payload_planned=500, fuel_planned=30)
+        app.db.session.add(d)
+        app.db.session.flush()
+        app.book_dispatch_financials(d)
+        m = app.CargoManifest(date='2026-02-01', departure='KPOC', arrival='KCRQ', total_weight=400,
+                              dispatch_release_id=d.id)
+        app.db.session.add(m)
+        app.db.session.flush()
+        log = app.CrewLog(date='2026-02-01', flight_id='DEL1', origin='KPOC', destination='KCRQ', fuel_used=28,
+                          dispatch_release_id=d.id, cargo_manifest_id=m.id)
+        app.db.session.add(log)
+        app.db.session.flush()
+        app.reconcile_fuel(log)
+        app.db.session.add(app.CrewLogSignOff(crew_log_id=log.id, employee_id=emp.id))
+        app.db.session.add(app.CargoManifestSignOff(cargo_manifest_id=m.id, employee_id=emp.id))
+        incident = app.Incident(date='2026-02-01', title='Bird strike', estimated_cost=250.0, dispatch_release_id=d.id)
+        app.db.session.add(incident)
+        app.db.session.flush()
+        app.book_incident_expense(incident)
+        return d.id, m.id, log.id
+
+
+def test_delete_dispatch_detaches_its_records(app, client, enforce_foreign_keys):
+    dispatch_id, manifest_id, log_id = _linked_dispatch(app)
+    with app.app.app_context():
+        balance = app.ledger_balance()
+    assert client.post(f'/dispatch/delete/{dispatch_id}').status_code == 302
+    with app.app.app_context():
+        assert app.db.session.get(app.DispatchRelease, dispatch_id) is None
+        assert app.DispatchFinancials.query.filter_by(dispatch_release_id=dispatch_id).count() == 0
+        assert app.db.session.get(app.CargoManifest, manifest_id).dispatch_release_id is None
+        assert app.db.session.get(app.CrewLog, log_id).dispatch_release_id is None
+        assert app.Transaction.query.filter_by(dispatch_release_id=dispatch_id).count() == 0
+        assert app.ledger_balance() == pytest.approx(balance)  # the ledger keeps its entries
+
+
+@pytest.mark.parametrize('kind', ['crew', 'cargo'])
+def test_delete_signed_off_record(app, client, enforce_foreign_keys, kind):
+    _dispatch_id, manifest_id, log_id = _linked_dispatch(app)
+    record_id = log_id if kind == 'crew' else manifest_id
+    with app.app.app_context():
+        balance = app.ledger_balance()
+    assert client.post(f'/{kind}/delete/{record_id}').status_code == 302
+    with app.app.app_context():
+        assert app.CrewLogSignOff.query.filter_by(crew_log_id=log_id).count() == (0 if kind == 'crew' else 1)
+        assert app.CargoManifestSignOff.query.filter_by(cargo_manifest_id=manifest_id).count() == \
+            (0 if kind == 'cargo' else 1)
+        assert app.ledger_balance() == pytest.approx(balance)
+
+
+def test_delete_fleet_entry_in_use(app, client, enforce_foreign_keys):
+    with app.app.app_context():
+        fleet_id = app.DispatchRelease.query.filter(app.DispatchRelease.fleet_entry_id.isnot(None)).first().fleet_entry_id
+    assert client.post(f'/fleet/delete/{fleet_id}').status_code == 302
+    with app.app.app_context():
+        assert app.db.session.get(app.FleetEntry, fleet_id) is None
+        assert app.DispatchRelease.query.filter_by(fleet_entry_id=fleet_id).count() == 0
@@ -0,0 +1,63 @@
+"""Imported jobs book the cargo they carry and stay planned until flown."""
+import pytest
+
+JOB = """# Flight Job: PRA900
+
+**Date (UTC):** 2026-05-02
+
+## Dispatch Release
+- Flight ID / Callsign: PRA900
+- Aircraft: Cessna 208 Caravan N208PA
+- Departure (ICAO): KPOC
+- Destination (ICAO): KCRQ
+- Route: KPOC DCT KCRQ
+- Planned Payload (lbs): 1200
+- Planned Fuel (gal or lbs): 80
+
+## Cargo Manifest (Planned)
+| Item | Description | Weight (lbs) | Special Handling |
+|------|-------------|--------------|------------------|
+| 1 | Machine parts | 500 | None |
+| 2 | Mail | 250 | None |
+
+**Total Pieces:** 2
+**Total Cargo Weight (lbs):** 750
+
+## Crew Log (Forecast Data)
+- Pilot in Command: A. Pilot
+- Estimated Block Time (hh:mm): 00:45
+"""
+
+
+def _import(app):
+    with app.app.app_context():
+        report = app.import_jobs([('pra900.md', JOB)])
+        assert report['imported'] == 1, report
+        return app.DispatchRelease.query.filter_by(flight_id='PRA900').one().id
+
+
+def _route_flights(app, monkeypatch):
+    monkeypatch.setattr(app, 'REPORT_SETTLE_SECONDS', 0)
+    with app.app.app_context():
+        app.refresh_report_rollups(full=True)
+        return {key: flights for key, _rev, _exp, flights, _planned, _used in app.report_totals('route')}
+
+
+def test_import_books_the_linked_cargo(app):
+    dispatch_id = _import(app)
+    with app.app.app_context():
+        dispatch = app.db.session.get(app.DispatchRelease, dispatch_id)
+        assert dispatch.actual_cargo_weight == 750
+        _revenue, _costs, profit, _distance = app.get_dispatch_financials(dispatch)  # refreshed if stale
+        assert app.ledger_net(app.Transaction.dispatch_release_id == dispatch_id) == pytest.approx(profit)
+
+
+def test_forecast_crew_log_is_not_a_flight(app, client, monkeypatch):
+    flights = _route_flights(app, monkeypatch)
+    dispatch_id = _import(app)
+    with app.app.app_context():
+        assert app.CrewLog.query.filter_by(dispatch_release_id=dispatch_id).one().forecast == 1
+    client.post(f'/dispatch/{dispatch_id}/toggle_complete')
+    with app.app.app_context():
+        assert app.db.session.get(app.DispatchRelease, dispatch_id).completed == 0
+    assert _route_flights(app, monkeypatch) == flights
@@ -0,0 +1,96 @@
+"""The ledger is append-only; the balance is the latest checkpoint plus the settled tail."""
+import datetime
+
+import pytest
+
+from conftest import login
+
+
+def _post(app, *amounts):
+    """Post the signed amounts; returns their transaction ids."""
+    with app.app.app_context(), app.unit_of_work():
+        txns = [app.post_ledger_entry(amount, f'Test entry {i}') for i, amount in enumerate(amounts)]
+        app.db.session.flush()
+        return [txn.id for txn in txns]
+
+
+def _age(app, ids, seconds):
+    """Backdate transactions, as if they were posted seconds ago."""
+    with app.app.app_context(), app.unit_of_work():
+        moment = datetime.datetime.utcnow() - datetime.timedelta(seconds=seconds)
+        app.db.session.execute(app.db.update(app.Transaction).where(app.Transaction.id.in_(ids))
+                               .values(timestamp=moment))
+
+
+def test_posted_transactions_cannot_be_edited_or_deleted(app):
+    txn_id, = _post(app, 125.0)
+    with app.app.app_context():
+        txn = app.db.session.get(app.Transaction, txn_id)
+        txn.amount = 1.0
+        with pytest.raises(ValueError, match='already posted'):
+            app.db.session.flush()
+        app.db.session.rollback()
+        app.db.session.delete(app.db.session.get(app.Transaction, txn_id))
+        with pytest.raises(ValueError, match='already posted'):
+            app.db.session.flush()
+        app.db.session.rollback()
+        assert app.db.session.get(app.Transaction, txn_id).amount == 125.0
+
+
+def test_api_refuses_to_patch_transactions(app):
+    txn_id, = _post(app, 125.0)
+    response = login(app).patch('/api/v1/transactions', json=[{'id': txn_id, 'amount': 1.0}])
+    assert response.status_code == 405
+    with app.app.app_context():
+        assert app.db.session.get(app.Transaction, txn_id).amount == 125.0
+
+
+def test_checkpoint_covers_only_settled_transactions(app):
+    settled = _post(app, 100.0, -30.0)
+    recent = _post(app, 55.0)
+    with app.app.app_context():
+        assert app.checkpoint_ledger(force=True) is None  # everything is inside the settle window
+    _age(app, settled, app.LEDGER_SETTLE_SECONDS + 1)
+    with app.app.app_context():
+        assert app.checkpoint_ledger() is None  # fewer than LEDGER_CHECKPOINT_EVERY settled entries
+        cp = app.checkpoint_ledger(force=True)
+        assert cp.transaction_id == max(settled) < recent[0]
+        assert cp.balance == pytest.approx(app.ledger_net(app.Transaction.id <= max(settled)))
+
+
+def test_checkpoint_is_written_once_the_tail_is_long_enough(app, monkeypatch):
+    monkeypatch.setitem(app.app.config, 'LEDGER_CHECKPOINT_EVERY', 3)
+    with app.app.app_context():
+        sample = [txn_id for txn_id, in app.db.session.query(app.Transaction.id)]
+    _age(app, sample, app.LEDGER_SETTLE_SECONDS + 1)
+    with app.app.app_context():
+        start = app.checkpoint_ledger(force=True).transaction_id  # the sample data's entries
+    ids = _post(app, 10.0, 20.0)
+    _age(app, ids, app.LEDGER_SETTLE_SECONDS + 1)
+    with app.app.app_context():
+        assert app.checkpoint_ledger() is None
+    ids += _post(app, 30.0)
+    _age(app, ids, app.LEDGER_SETTLE_SECONDS + 1)
+    with app.app.app_context():
+        assert app.checkpoint_ledger().transaction_id == max(ids) > start
+
+
+def test_balance_is_checkpoint_plus_tail(app):
+    ids = _post(app, 100.0, -30.0)
+    _age(app, ids, app.LEDGER_SETTLE_SECONDS + 1)
+    with app.app.app_context():
+        cp = app.checkpoint_ledger(force=True)
+        checkpoint_id, checkpoint_balance = cp.transaction_id, cp.balance
+    _post(app, 40.0, -15.0)
+    with app.app.app_context():
+        full = app.ledger_net()
+        assert app.ledger_balance() == pytest.approx(full)
+        assert app.ledger_balance() == pytest.approx(checkpoint_balance + 25.0)
+        assert app.verify_ledger_checkpoints() == []
+        # The balance reads the checkpoint, not the whole ledger
+        with app.unit_of_work():
+            app.db.session.execute(app.db.update(app.LedgerCheckpoint)
+                                   .where(app.LedgerCheckpoint.transaction_id == checkpoint_id)
+                                   .values(balance=checkpoint_balance + 1000.0))
+        assert app.ledger_balance() == pytest.approx(full + 1000.0)
+        assert [expected for _cp, expected in app.verify_ledger_checkpoints()] == [pytest.approx(checkpoint_balance)]
@@ -0,0 +1,23 @@
+"""Cached pages are stored under the key of the data they show."""
+
+
+def test_settings_saved_by_another_worker_reach_cached_pages(app, client):
+    assert b'Palm Route Air' in client.get('/').data
+    with app.app.app_context():
+        # Written like another process would: this one's session listeners never see it
+        with app.db.engine.begin() as conn:
+            conn.execute(app.db.update(app.AppSettings).values(company_name='Gulf Route Air'))
+            app.bump_change_versions(['app_settings'], conn)
+    assert b'Gulf Route Air' in client.get('/').data
+
+
+def test_refreshing_a_snapshot_does_not_orphan_the_stored_page(app, client):
+    with app.app.app_context(), app.unit_of_work():
+        dispatch_id = app.DispatchFinancials.query.first().dispatch_release_id
+        app.db.session.execute(app.db.update(app.DispatchFinancials).values(stale=1))
+        app.touch_tables(app.db.session, 'dispatch_financials')
+    client.get('/fleet/history')  # shows the login flash; pages that do are not stored
+    first = client.get(f'/dispatch/{dispatch_id}')
+    assert first.status_code == 200
+    again = client.get(f'/dispatch/{dispatch_id}', headers={'If-None-Match': first.headers['ETag']})
+    assert again.status_code == 304
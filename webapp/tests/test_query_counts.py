@@ -0,0 +1,61 @@
+"""Pages must issue the same number of SQL statements however many rows they show."""
+import pytest
+from sqlalchemy import event
+
+PAGES = ['/', '/cargo/history', '/dispatch/history', '/crew/history', '/incidents', '/notams/history',
+         '/fleet/history', '/dispatch/1', '/cargo/1', '/crew/1']
+
+
+def add_flights(app, count):
+    """count completed dispatches, each with a manifest, a crew log, sign-offs, an incident and a transaction."""
+    with app.app.app_context(), app.unit_of_work():
+        emp = app.Employee.query.first()
+        for i in range(count):
+            d = app.DispatchRelease(date='2026-01-01', flight_id=f'QC{i}', route='KPOC DCT KCRQ',
+                                    departure='KPOC', destination='KCRQ', completed=1)
+            app.db.session.add(d)
+            app.db.session.flush()
+            m = app.CargoManifest(date='2026-01-01', departure='KPOC', arrival='KCRQ', total_weight=100,
+                                  dispatch_release_id=d.id)
+            app.db.session.add(m)
+            app.db.session.flush()
+            log = app.CrewLog(date='2026-01-01', flight_id=f'QC{i}', origin='KPOC', destination='KCRQ',
+                              fuel_used=20, dispatch_release_id=d.id, cargo_manifest_id=m.id)
+            app.db.session.add(log)
+            app.db.session.flush()
+            app.db.session.add(app.CrewLogSignOff(crew_log_id=log.id, employee_id=emp.id))
+            app.db.session.add(app.CargoManifestSignOff(cargo_manifest_id=m.id, employee_id=emp.id))
+            app.db.session.add(app.Incident(date='2026-01-01', title=f'QC{i}', estimated_cost=1.0,
+                                            dispatch_release_id=d.id))
+            app.post_ledger_entry(1.0, f'QC{i}', dispatch_release_id=d.id)
+
+
+@pytest.fixture
+def count_statements(app, client, monkeypatch):
+    monkeypatch.setattr(app, 'page_cache', None)  # measure the render, not a cache hit
+    counter = {'n': 0}
+
+    def on_execute(*_args):
+        counter['n'] += 1
+
+    with app.app.app_context():
+        engine = app.db.engine
+    event.listen(engine, 'before_cursor_execute', on_execute)
+
+    def count(path):
+        client.get(path)  # first visit may refresh snapshots / rollups; measure the steady state
+        counter['n'] = 0
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+        return counter['n']
+
+    yield count
+    event.remove(engine, 'before_cursor_execute', on_execute)
+
+
+def test_statements_per_page_do_not_grow_with_rows(app, count_statements):
+    add_flights(app, 5)
+    small = {path: count_statements(path) for path in PAGES}
+    add_flights(app, 120)
+    large = {path: count_statements(path) for path in PAGES}
+    assert large == small
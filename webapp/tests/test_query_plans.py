@@ -0,0 +1,22 @@
+"""Hot queries must be answered from an index: no table scans, no sorts outside an index."""
+import pytest
+
+
+def test_hot_queries_use_indexes(app):
+    with app.app.app_context():
+        plans = app.explain_hot_queries()
+    problems = {name: (details, found) for name, (details, found) in plans.items() if found}
+    assert not problems
+
+
+@pytest.mark.parametrize('period', ['day', 'week', 'month'])
+def test_ledger_period_totals_group_in_index_order(app, period):
+    with app.app.app_context():
+        if app.db.engine.dialect.name != 'sqlite':
+            pytest.skip('expression indexes on the period label are SQLite-only')
+        bucket = app._ledger_period(period)
+        stmt = (app.db.select(bucket, app.db.func.count()).where(app._ledger_since(period, app.datetime.datetime(2024, 1, 1)))
+                .group_by(bucket).order_by(bucket.desc()))
+        sql = str(stmt.compile(dialect=app.db.engine.dialect, compile_kwargs={'literal_binds': True}))
+        plan = [row[-1] for row in app.db.session.execute(app.db.text(f'EXPLAIN QUERY PLAN {sql}'))]
+    assert plan == [f'SEARCH transaction USING INDEX ix_transaction_{period} (<expr>>?)']
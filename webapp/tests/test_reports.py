@@ -0,0 +1,71 @@
+"""Incremental report refreshes add up to the same totals as a full rebuild."""
+import datetime
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def settle_at_once(app, monkeypatch):
+    monkeypatch.setattr(app, 'REPORT_SETTLE_SECONDS', 0)
+
+
+def _totals(app, dimension, full=False):
+    with app.app.app_context():
+        app.refresh_report_rollups(full=full)
+        return {key: tuple(round(value or 0, 6) for value in values)
+                for key, *values in app.report_totals(dimension)}
+
+
+def _book_dispatch(app):
+    with app.app.app_context(), app.unit_of_work():
+        d = app.DispatchRelease(date='2026-03-01', flight_id='RPT1', departure='KPOC', destination='KCRQ',
+                                payload_planned=500, fuel_planned=30)
+        app.db.session.add(d)
+        app.db.session.flush()
+        app.book_dispatch_financials(d)
+        return d.id
+
+
+def _sign_off(app, dispatch_id):
+    with app.app.app_context(), app.unit_of_work():
+        emp = app.Employee.query.first()
+        log = app.CrewLog(date='2026-03-01', flight_id='RPT1', origin='KPOC', destination='KCRQ', fuel_used=28,
+                          dispatch_release_id=dispatch_id)
+        app.db.session.add(log)
+        app.db.session.flush()
+        app.db.session.add(app.CrewLogSignOff(crew_log_id=log.id, employee_id=emp.id))
+        return str(emp.id)
+
+
+def test_pilot_gets_ledger_entries_booked_before_the_sign_off(app):
+    _totals(app, 'pilot')
+    dispatch_id = _book_dispatch(app)
+    _totals(app, 'pilot')  # folds the booking before any crew log exists
+    pilot = _sign_off(app, dispatch_id)
+    incremental = _totals(app, 'pilot')
+    revenue, expense = incremental[pilot][:2]
+    assert revenue > 0 and expense > 0
+    assert incremental == _totals(app, 'pilot', full=True)
+
+
+def test_pilot_entries_are_counted_once_when_booked_with_the_sign_off(app):
+    _totals(app, 'pilot')
+    dispatch_id = _book_dispatch(app)
+    _sign_off(app, dispatch_id)
+    _totals(app, 'pilot')  # the booking and the sign-off in one refresh
+    with app.app.app_context(), app.unit_of_work():
+        app.post_ledger_entry(-40.0, 'Landing fee', dispatch_release_id=dispatch_id)
+    incremental = _totals(app, 'pilot')
+    assert incremental == _totals(app, 'pilot', full=True)
+
+
+def test_refresh_leaves_unsettled_rows_for_later(app, monkeypatch):
+    _totals(app, 'pilot')
+    monkeypatch.setattr(app, 'REPORT_SETTLE_SECONDS', 60)
+    pilot = _sign_off(app, _book_dispatch(app))
+    assert pilot not in _totals(app, 'pilot')  # everything is younger than the settle window
+    with app.app.app_context(), app.unit_of_work():
+        an_hour_ago = datetime.datetime.utcnow() - datetime.timedelta(hours=1)
+        for _model, created, _rows in app.REPORT_SOURCES.values():
+            app.db.session.execute(app.db.update(created.class_).values({created.key: an_hour_ago}))
+    assert pilot in _totals(app, 'pilot')